@@ -0,0 +1,161 @@
+import numpy as np
+from numba import njit, prange
+
+# uint64 constants, so that the bitwise operations below never get promoted to signed or float types
+_ZERO = np.uint64(0)
+_ONE = np.uint64(1)
+_WORD_BITS = 64
+
+
+@njit("void(uint8[:, ::1], uint64[:, ::1])", parallel=True, cache=True, boundscheck=False)
+def pack_rows(state, packed):
+    """Pack a uint8 state array into 64-cell words.
+
+    Args:
+        state (np.ndarray): The (rows, cols) uint8 state array.
+        packed (np.ndarray): The (rows, ceil(cols / 64)) uint64 array that receives the packed rows.
+
+    Column `col` of a row is stored in bit `col % 64` of word `col // 64`; unused bits of the last word are zero.
+    """
+    rows, cols = state.shape
+    words = packed.shape[1]
+    for row in prange(rows):
+        for word in range(words):
+            start = word * _WORD_BITS
+            value = _ZERO
+            for bit in range(min(_WORD_BITS, cols - start)):
+                if state[row, start + bit]:
+                    value |= _ONE << np.uint64(bit)
+            packed[row, word] = value
+
+
+@njit("void(uint64[:, ::1], uint8[:, ::1])", parallel=True, cache=True, boundscheck=False)
+def unpack_rows(packed, state):
+    """Unpack 64-cell words back into a uint8 state array.
+
+    Args:
+        packed (np.ndarray): The (rows, ceil(cols / 64)) uint64 array of packed rows.
+        state (np.ndarray): The (rows, cols) uint8 array that receives the unpacked cells.
+    """
+    rows, cols = state.shape
+    for row in prange(rows):
+        for col in range(cols):
+            state[row, col] = (packed[row, col // _WORD_BITS] >> np.uint64(col % _WORD_BITS)) & _ONE
+
+
+@njit(cache=True, boundscheck=False)
+def _shift_west(packed, row, word, last_word, last_bits):
+    """Return the word whose bit `c` holds the cell at column `c - 1` of the row (with toroidal wrapping)."""
+    if word == 0:
+        carry = (packed[row, last_word] >> np.uint64(last_bits - 1)) & _ONE
+    else:
+        carry = packed[row, word - 1] >> np.uint64(_WORD_BITS - 1)
+    return (packed[row, word] << _ONE) | carry
+
+
+@njit(cache=True, boundscheck=False)
+def _shift_east(packed, row, word, last_word, last_bits):
+    """Return the word whose bit `c` holds the cell at column `c + 1` of the row (with toroidal wrapping)."""
+    if word == last_word:
+        carry = (packed[row, 0] & _ONE) << np.uint64(last_bits - 1)
+    else:
+        carry = packed[row, word + 1] << np.uint64(_WORD_BITS - 1)
+    return (packed[row, word] >> _ONE) | carry
+
+
+@njit("void(uint64[:, ::1], uint64[:, ::1], int64, float32)", parallel=True, cache=True, boundscheck=False)
+def step_packed(packed, new_packed, cols, revival_prob):
+    """Advance a bit-packed grid by one generation, 64 cells per word operation.
+
+    Args:
+        packed (np.ndarray): The (rows, words) uint64 array of the current generation (see `pack_rows`).
+        new_packed (np.ndarray): The (rows, words) uint64 array that receives the next generation.
+        cols (int): The number of columns of the grid.
+        revival_prob (float): The probability of revival for dead cells with 2 or 4 live neighbors.
+
+    For each word, the eight neighbor bit-planes (the rows above, at and below shifted west and east) are
+    summed with bitwise half/full adders into a 3-bit-per-cell count (mod 8, which is enough to tell 2, 3
+    and 4 apart). The rules are then applied as masks; a random number is only drawn for the dead cells
+    that are candidates for revival, whose bits are visited directly instead of testing all 64.
+    """
+    rows, words = packed.shape
+    last_word = words - 1
+    last_bits = cols - last_word * _WORD_BITS
+    if last_bits == _WORD_BITS:
+        last_mask = ~_ZERO
+    else:
+        last_mask = (_ONE << np.uint64(last_bits)) - _ONE
+
+    for row in prange(rows):
+        up = (row - 1) % rows
+        down = (row + 1) % rows
+        for word in range(words):
+            mid = packed[row, word]
+
+            # top row: three cells -> 2-bit count (full adder)
+            a = _shift_west(packed, up, word, last_word, last_bits)
+            b = packed[up, word]
+            c = _shift_east(packed, up, word, last_word, last_bits)
+            top0 = a ^ b ^ c
+            top1 = (a & b) | (c & (a ^ b))
+
+            # middle row: two cells -> 2-bit count (half adder)
+            a = _shift_west(packed, row, word, last_word, last_bits)
+            c = _shift_east(packed, row, word, last_word, last_bits)
+            mid0 = a ^ c
+            mid1 = a & c
+
+            # bottom row: three cells -> 2-bit count (full adder)
+            a = _shift_west(packed, down, word, last_word, last_bits)
+            b = packed[down, word]
+            c = _shift_east(packed, down, word, last_word, last_bits)
+            bot0 = a ^ b ^ c
+            bot1 = (a & b) | (c & (a ^ b))
+
+            # summing the three 2-bit counts into bits (sum0, sum1, sum2) of the neighbor count
+            sum0 = top0 ^ mid0 ^ bot0
+            carry0 = (top0 & mid0) | (bot0 & (top0 ^ mid0))
+            pair0 = top1 ^ mid1
+            pair1 = bot1 ^ carry0
+            both0 = top1 & mid1
+            both1 = bot1 & carry0
+            sum1 = pair0 ^ pair1
+            sum2 = (both0 | both1 | (pair0 & pair1)) & ~(both0 & both1)
+
+            two = ~sum0 & sum1 & ~sum2
+            three = sum0 & sum1 & ~sum2
+            four = ~sum0 & ~sum1 & sum2
+
+            mask = last_mask if word == last_word else ~_ZERO
+            next_word = (three | (mid & two)) & mask
+
+            # visiting only the set bits of the candidates mask, lowest first (`x & -x` isolates the lowest one)
+            candidates = ~mid & (two | four) & mask
+            while candidates:
+                flag = candidates & (~candidates + _ONE)
+                if np.random.random() < revival_prob:
+                    next_word |= flag
+                candidates ^= flag
+
+            new_packed[row, word] = next_word
+
+
+@njit("void(uint8[:, ::1], uint8[:, ::1], float32)", cache=True)
+def step(state, new_state, revival_prob):
+    """Advance the grid by one generation using the bit-packed kernel.
+
+    Args:
+        state (np.ndarray): The (rows, cols) uint8 state array of the current generation.
+        new_state (np.ndarray): The (rows, cols) uint8 array that receives the next generation.
+        revival_prob (float): The probability of revival for dead cells with 2 or 4 live neighbors.
+
+    The state is packed into 64-cell words, advanced with `step_packed` and unpacked into `new_state`.
+    The signatures are given explicitly so the kernels are compiled when this module is imported.
+    """
+    rows, cols = state.shape
+    words = (cols + _WORD_BITS - 1) // _WORD_BITS
+    packed = np.empty((rows, words), dtype=np.uint64)
+    new_packed = np.empty((rows, words), dtype=np.uint64)
+    pack_rows(state, packed)
+    step_packed(packed, new_packed, cols, revival_prob)
+    unpack_rows(new_packed, new_state)
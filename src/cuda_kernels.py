@@ -0,0 +1,189 @@
+import numpy as np
+from numba import cuda, float32, int32, uint8, uint32, void
+from numba.cuda.random import xoroshiro128p_type, xoroshiro128p_uniform_float32
+
+# the update kernel works on 32-bit words holding 4 consecutive cells of a row
+CELLS_PER_WORD = 4
+
+
+def _threads_per_block():
+    """Return the (x, y) block shape for the current device.
+
+    The x dimension is one warp, so a warp covers `WARP_SIZE` consecutive words of one row (128 cells, one
+    contiguous 128-byte segment, on current GPUs), and the y dimension stacks up to 8 warps without exceeding
+    the device's `MAX_THREADS_PER_BLOCK`. The CUDA simulator has no device to query, so the usual values
+    (32-thread warps, 1024 threads per block) are used there.
+    """
+    get_current_device = getattr(cuda, "get_current_device", None)
+    device = get_current_device() if get_current_device is not None else None
+    warp_size = getattr(device, "WARP_SIZE", 32)
+    max_threads = getattr(device, "MAX_THREADS_PER_BLOCK", 1024)
+    return warp_size, max(1, min(8, max_threads // warp_size))
+
+
+# (x, y) block shape, specialized to the GPU when this module is imported (the kernels below are compiled then too)
+THREADS_PER_BLOCK = _threads_per_block()
+BLOCK_WIDTH, BLOCK_HEIGHT = THREADS_PER_BLOCK
+# shared memory tile of a block: its words plus a one-word halo on every side
+TILE_WIDTH = BLOCK_WIDTH + 2
+TILE_HEIGHT = BLOCK_HEIGHT + 2
+
+# host-side zero used to reset the active cell counters
+_ZERO_COUNT = np.zeros(1, dtype=np.int32)
+
+
+# the kernels are compiled for these signatures when this module is imported, instead of on their first launch
+@cuda.jit(void(float32[:, ::1], xoroshiro128p_type[::1]))
+def fill_rng_kernel(rnd, rng_states):
+    """Draw one uniform random number per cell from the cell's own RNG stream into `rnd`."""
+    x, y = cuda.grid(2)
+    height, width = rnd.shape
+    if x < width and y < height:
+        rnd[y, x] = xoroshiro128p_uniform_float32(rng_states, y * width + x)
+
+
+@cuda.jit(void(uint32[:, ::1], uint32[:, ::1], float32[:, ::1], int32[::1], int32[::1], float32, float32))
+def update_grid_kernel(words, new_words, rnd, total, new_total, base_prob, max_prob):
+    """Count the active neighbors of each cell and apply the update rules, 4 cells per thread.
+
+    The grid is read as 32-bit words (byte `k` of word `i` is the cell at column `4 * i + k`), so each
+    thread loads and stores its 4 cells with single 32-bit accesses. The block first copies its words and
+    a one-word halo (wrapped around the edges, as the grid is a toroidal array) into a shared memory tile,
+    each thread loading tile words in a strided loop, so every word is read from global memory about once
+    per block instead of nine times.
+
+    The neighbor counts of the 4 cells are then summed in parallel byte lanes of a register: for each of the
+    three rows, the word shifted by one cell west and east gives the left and right neighbors, and since a
+    count never exceeds 8 no lane carries into the next. No intermediate array is written to global memory.
+    The rules are evaluated as straight-line boolean expressions with no branch on the cell data, so the
+    threads of a warp never diverge. The random number of each cell, used for revivals, is read from `rnd`
+    (filled by `fill_rng_kernel`), so this kernel keeps no RNG state in registers.
+
+    The revival probability is derived on the device from the active cell count in `total[0]`, and the
+    active cells of the next generation are added to `new_total[0]` (one atomic per block, after a shared
+    memory reduction), so consecutive generations never wait for the host to read the density back.
+
+    Memory layout: `words` and `new_words` must be C-contiguous (row-major). `threadIdx.x` maps to the word
+    (innermost, fastest-varying) axis and `threadIdx.y` to the row axis, so consecutive lanes of a warp read
+    and write consecutive words of a row and every global access is coalesced.
+    """
+    tile = cuda.shared.array((TILE_HEIGHT, TILE_WIDTH), dtype=uint32)
+    block_total = cuda.shared.array(1, dtype=int32)
+    tx = cuda.threadIdx.x
+    ty = cuda.threadIdx.y
+    height, width = words.shape
+    if tx == 0 and ty == 0:
+        block_total[0] = 0
+
+    # grid coordinates (in words) of the top-left halo word of the tile
+    tile_x = cuda.blockIdx.x * BLOCK_WIDTH - 1
+    tile_y = cuda.blockIdx.y * BLOCK_HEIGHT - 1
+    for i in range(ty * BLOCK_WIDTH + tx, TILE_HEIGHT * TILE_WIDTH, BLOCK_WIDTH * BLOCK_HEIGHT):
+        row = i // TILE_WIDTH
+        col = i % TILE_WIDTH
+        tile[row, col] = words[(tile_y + row) % height, (tile_x + col) % width]
+    cuda.syncthreads()
+
+    # adjusting revival probability based on population density (sparser -> higher revival chance)
+    density = float32(total[0]) / float32(height * width * CELLS_PER_WORD)
+    revival_prob = base_prob + (float32(1) - density) * (max_prob - base_prob)
+
+    x = tile_x + 1 + tx
+    y = tile_y + 1 + ty
+    # no early return: every thread of the block must reach the barrier of the reduction below
+    if x < width and y < height:
+        live_neighbors = 0
+        for row in range(ty, ty + 3):
+            west = (tile[row, tx + 1] << 8) | (tile[row, tx] >> 24)
+            east = (tile[row, tx + 1] >> 8) | (tile[row, tx + 2] << 24)
+            live_neighbors += west + east
+            if row != ty + 1:
+                live_neighbors += tile[row, tx + 1]
+
+        cells = tile[ty + 1, tx + 1]
+        first_col = x * CELLS_PER_WORD
+        new_cells = uint32(0)
+        for k in range(CELLS_PER_WORD):
+            shift = 8 * k
+            count = (live_neighbors >> shift) & 0xFF
+            alive = (cells >> shift) & 1
+            draw = rnd[y, first_col + k]
+
+            # branchless rules: every lane of a warp runs the same instructions whatever the cell's state
+            standard = (count == 3) | ((alive == 1) & (count == 2))
+            revive = (alive == 0) & ((count == 2) | (count == 4)) & (draw < revival_prob)
+            # Numba types a shift as a 64-bit integer, so the word is cast back to 32 bits
+            new_cells = uint32(new_cells | (uint32(standard | revive) << shift))
+        new_words[y, x] = new_cells
+
+        # the 4 bytes are 0 or 1, so the multiplication sums them into byte 3 (masked in case of wider types)
+        active = ((new_cells * uint32(0x01010101)) >> 24) & 0xFF
+        if active:
+            cuda.atomic.add(block_total, 0, int32(active))
+    cuda.syncthreads()
+
+    if tx == 0 and ty == 0 and block_total[0]:
+        cuda.atomic.add(new_total, 0, block_total[0])
+
+
+@cuda.jit(void(uint8[:, ::1], int32[::1]))
+def count_alive_kernel(grid, total):
+    """Accumulate the number of active cells into `total[0]`."""
+    x, y = cuda.grid(2)
+    height, width = grid.shape
+    if x < width and y < height and grid[y, x]:
+        cuda.atomic.add(total, 0, 1)
+
+
+def _blocks_per_grid(shape):
+    """Return the number of blocks needed to cover a (rows, cols) array, without launching any empty block."""
+    height, width = shape
+    return (width + BLOCK_WIDTH - 1) // BLOCK_WIDTH, (height + BLOCK_HEIGHT - 1) // BLOCK_HEIGHT
+
+
+def count_alive(grid, total, stream=0) -> None:
+    """Count the active cells of a device-resident grid into `total[0]`.
+
+    Args:
+        grid (DeviceNDArray): The (rows, cols) uint8 grid on the device.
+        total (DeviceNDArray): A one-element int32 device array that receives the count.
+        stream (Stream): The CUDA stream to run on (the default stream if omitted).
+
+    The count stays on the device, ready for `run_cuda_kernels`; this function does not wait for it.
+    It is only needed for a grid uploaded from the host, as the update counts the generations it computes.
+    """
+    total.copy_to_device(_ZERO_COUNT, stream=stream)
+    count_alive_kernel[_blocks_per_grid(grid.shape), THREADS_PER_BLOCK, stream](grid, total)
+
+
+def run_cuda_kernels(grid, new_grid, rnd, rng_states, total, new_total, base_prob: float, max_prob: float,
+                     stream=0) -> None:
+    """Advance a device-resident grid by one generation.
+
+    Args:
+        grid (DeviceNDArray): The (rows, cols) uint8 grid of the current generation.
+        new_grid (DeviceNDArray): The (rows, cols) uint8 array that receives the next generation.
+        rnd (DeviceNDArray): A (rows, cols) float32 scratch array for the random number of each cell.
+        rng_states (DeviceNDArray): One xoroshiro128p state per cell.
+        total (DeviceNDArray): A one-element int32 array holding the active cell count of `grid`.
+        new_total (DeviceNDArray): A one-element int32 array that receives the active cell count of `new_grid`.
+        base_prob (float): The revival probability of a fully populated grid.
+        max_prob (float): The revival probability of an empty grid.
+        stream (Stream): The CUDA stream to launch on (the default stream if omitted).
+
+    The revival probability of dead cells with 2 or 4 live neighbors is interpolated between `base_prob` and
+    `max_prob` from the density in `total`, on the device. The kernels are only queued on `stream`, this
+    function does not wait for them to finish.
+    All arrays stay on the device; nothing is copied between host and device. The grids are reinterpreted
+    as uint32 words without a copy, so they must be C-contiguous (see `update_grid_kernel`) and have a
+    number of columns that is a multiple of `CELLS_PER_WORD`, otherwise a `ValueError` is raised.
+    """
+    if not (grid.is_c_contiguous() and new_grid.is_c_contiguous()):
+        raise ValueError("The device grids must be C-contiguous")
+    if grid.shape[1] % CELLS_PER_WORD:
+        raise ValueError(f"The number of columns must be a multiple of {CELLS_PER_WORD} for the CUDA update")
+    new_total.copy_to_device(_ZERO_COUNT, stream=stream)
+    fill_rng_kernel[_blocks_per_grid(rnd.shape), THREADS_PER_BLOCK, stream](rnd, rng_states)
+    words = grid.view(np.uint32)
+    update_grid_kernel[_blocks_per_grid(words.shape), THREADS_PER_BLOCK, stream](
+        words, new_grid.view(np.uint32), rnd, total, new_total, base_prob, max_prob)
@@ -1,16 +1,162 @@
-from dataclasses import dataclass
-from typing import List, Tuple
-import pickle
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+import numpy as np
 from gui import Cell
-from utils import WINDOW_WIDTH, WINDOW_HEIGHT, CELL_SIZE, BASE_REVIVAL_PROB, MAX_REVIVAL_PROB, DEATH_PROB
+from utils import ROWS, COLS, BASE_REVIVAL_PROB, MAX_REVIVAL_PROB, DEATH_PROB
 import random as rd
-from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
+import zipfile
+
+# (row, col) coordinates of the active cells of each supported initial pattern
+# still life patterns (for the others that don't fit as well, e.g. blinker / glider)
+_PATTERNS = {
+    "glider": np.array([(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)], dtype=np.intp),
+    "blinker": np.array([(1, 0), (1, 1), (1, 2)], dtype=np.intp),
+    "block": np.array([(0, 0), (0, 1), (1, 0), (1, 1)], dtype=np.intp),
+    "bee-hive": np.array([(1, 2), (1, 3), (2, 1), (2, 4), (3, 2), (3, 3)], dtype=np.intp),
+    "loaf": np.array([(1, 2), (1, 3), (2, 1), (2, 4), (3, 2), (3, 5)], dtype=np.intp),
+    "boat": np.array([(1, 1), (1, 2), (2, 1), (2, 3), (3, 2)], dtype=np.intp),
+    "tub": np.array([(1, 2), (2, 1), (2, 3), (3, 2)], dtype=np.intp),
+}
+
+def _empty_state() -> np.ndarray:
+    """Create an all-inactive (ROWS, COLS) state array, the same shape as the one created by the GUI."""
+    return np.zeros((ROWS, COLS), dtype=np.uint8)
+
+def _step_python(game_logic: "GameLogic", new_state: np.ndarray, adjusted_revival_prob: float) -> None:
+    """Compute the next generation cell by cell with `GameLogic.update_row` (the reference implementation)."""
+    game_logic._refresh_wrap_tables()
+    for row in range(game_logic.state.shape[0]):
+        game_logic.update_row(row, new_state, adjusted_revival_prob)
+
+def _count_neighbors_numpy(state: np.ndarray) -> np.ndarray:
+    """Count the active neighbors of every cell at once.
+
+    This is the convolution of the state with the 3x3 kernel [[1, 1, 1], [1, 0, 1], [1, 1, 1]] in "wrap"
+    mode (toroidal array), computed as a separable 3x3 box sum over a wrapped copy of the state, minus the
+    cell itself: four whole-array additions instead of eight shifted copies. The sums are accumulated in
+    place into two uint8 buffers (a count never exceeds 9), so no other temporary array is created.
+    """
+    padded = np.pad(state, 1, mode="wrap")
+    row_sums = np.add(padded[:, :-2], padded[:, 1:-1])
+    row_sums += padded[:, 2:]
+    live_neighbors = np.add(row_sums[:-2], row_sums[1:-1])
+    live_neighbors += row_sums[2:]
+    live_neighbors -= state
+    return live_neighbors
+
+def _step_numpy(game_logic: "GameLogic", new_state: np.ndarray, adjusted_revival_prob: float) -> None:
+    """Compute the next generation with whole-array NumPy operations (see `_count_neighbors_numpy`)."""
+    state = game_logic.state
+    live_neighbors = _count_neighbors_numpy(state)
+    alive = state.astype(bool)
+    standard = (live_neighbors == 3) | (alive & (live_neighbors == 2))
+    candidates = ~alive & ((live_neighbors == 2) | (live_neighbors == 4))
+    revive = candidates & (np.random.random(state.shape) < adjusted_revival_prob)
+    np.bitwise_or(standard, revive, out=new_state, casting="unsafe")
+
+def _step_numba(game_logic: "GameLogic", new_state: np.ndarray, adjusted_revival_prob: float) -> None:
+    """Compute the next generation with the JIT-compiled, bit-packed `cpu_kernels.step` kernel."""
+    from cpu_kernels import step
+
+    step(game_logic.state, new_state, np.float32(adjusted_revival_prob))
+
+# host-side update of each CPU backend; the "cuda" backend keeps the grid on the device instead
+_CPU_STEPS = {
+    "python": _step_python,
+    "numpy": _step_numpy,
+    "numba": _step_numba,
+}
+BACKENDS = (*_CPU_STEPS, "cuda")
+
+@dataclass
+class _GpuScratch:
+    """Device buffers of the CUDA update, kept alive across generations and reallocated only for a new shape."""
+    shape: Tuple[int, int] # (rows, cols) of the grid the buffers were allocated for
+    stream: Any # CUDA stream all GPU work is queued on
+    host_buf: np.ndarray # pinned mirror of `d_a`
+    d_a: Any # current generation
+    d_b: Any # next generation
+    d_rng: Any # one xoroshiro128p state per cell
+    d_rnd: Any # one uniform random number per cell
+    d_total: Any # active cell count of `d_a`
+    d_new_total: Any # active cell count of `d_b`
+
+    @classmethod
+    def allocate(cls, state: np.ndarray, seed: int) -> "_GpuScratch":
+        """Allocate the buffers for `state` and upload it into `d_a`.
+
+        Args:
+            state (np.ndarray): The (rows, cols) uint8 state array to upload.
+            seed (int): The seed of the per-cell random streams.
+
+        Returns:
+            _GpuScratch: The buffers, with every allocation and copy queued on a new stream.
+        """
+        from numba import cuda
+        from numba.cuda.random import create_xoroshiro128p_states
+
+        stream = cuda.stream()
+        host_buf = cuda.pinned_array(state.shape, dtype=np.uint8)
+        host_buf[...] = state
+        return cls(
+            shape=state.shape,
+            stream=stream,
+            host_buf=host_buf,
+            d_a=cuda.to_device(host_buf, stream=stream),
+            d_b=cuda.device_array_like(state, stream=stream),
+            d_rng=create_xoroshiro128p_states(state.size, seed=seed, stream=stream),
+            d_rnd=cuda.device_array(state.shape, dtype=np.float32, stream=stream),
+            d_total=cuda.device_array(1, dtype=np.int32, stream=stream),
+            d_new_total=cuda.device_array(1, dtype=np.int32, stream=stream),
+        )
 
 @dataclass
 class GameLogic:
-    grid: List[List[Cell]]
-    lock: Lock = Lock()
+    state: np.ndarray = field(default_factory=_empty_state) # (rows, cols) uint8 array, 1 = active
+    backend: str = "numpy" # how `update` computes a generation, one of `BACKENDS` ("cuda" requires a GPU)
+    seed: Optional[int] = None # seed of the per-cell GPU random streams (None picks a random one)
+    _gpu: Optional[_GpuScratch] = field(default=None, init=False, repr=False) # device buffers, allocated on first use
+    _device_ahead: bool = field(default=False, init=False, repr=False) # `state` is older than `_gpu.d_a`
+    _back: Optional[np.ndarray] = field(default=None, init=False, repr=False) # next generation of the CPU update
+    _cells: Optional[List[List[Cell]]] = field(default=None, init=False, repr=False) # cached `grid`
+    _wrap: Optional[Tuple[List[int], ...]] = field(default=None, init=False, repr=False) # see `_refresh_wrap_tables`
+
+    def __post_init__(self) -> None:
+        if self.backend not in BACKENDS:
+            raise ValueError("Unknown backend: {}".format(self.backend))
+        self.state = np.ascontiguousarray(self.state, dtype=np.uint8)
+        self._refresh_wrap_tables()
+
+    @property
+    def grid(self) -> List[List[Cell]]:
+        """Get the grid as a 2D list of `Cell` objects.
+
+        Returns:
+            List[List[Cell]]: A grid of cells whose `is_active` reads and writes `state`.
+
+        The cells are created on first access (and again if the shape of `state` changes) for code that
+        still expects `Cell` objects; they hold no state of their own, so the updates never touch them.
+        """
+        rows, cols = self.state.shape
+        if self._cells is None or len(self._cells) != rows or len(self._cells[0]) != cols:
+            self._cells = [[Cell(self, row, col) for col in range(cols)] for row in range(rows)]
+        return self._cells
+
+    def _refresh_wrap_tables(self) -> None:
+        """Build the wrapped indices of the neighboring rows and columns if the shape of `state` changed.
+
+        The `up`, `down`, `left` and `right` tables (e.g. `up[row] == (row - 1) % rows`) are stored in `_wrap`,
+        so `count_neighbors` looks the wrapped indices up instead of computing a modulo for each neighbor.
+        The shape is only checked here, when `state` is created, initialized or loaded and once per `update`.
+        """
+        rows, cols = self.state.shape
+        if self._wrap is None or len(self._wrap[0]) != rows or len(self._wrap[2]) != cols:
+            self._wrap = (
+                [(row - 1) % rows for row in range(rows)],
+                [(row + 1) % rows for row in range(rows)],
+                [(col - 1) % cols for col in range(cols)],
+                [(col + 1) % cols for col in range(cols)],
+            )
 
     def _initialize_grid(self, pattern: str) -> None:
         """Initialize the grid with a given pattern.
@@ -19,32 +165,18 @@ class GameLogic:
             pattern (str): The name of the pattern to initialize the grid with.
                 Supported patterns: "glider", "blinker", "block", "bee-hive", "loaf", "boat", "tub".
 
-        This method creates a grid of `Cell` objects and sets cells to `True` (active) according to
-        the specified pattern, such as a "glider" or "block". It raises a `ValueError` if an invalid
-        pattern is provided.
+        This method resets the state array and sets cells to active according to the specified pattern,
+        such as a "glider" or "block". It raises a `ValueError` if an invalid pattern is provided.
         """
-        self.grid = [
-            [Cell(x * CELL_SIZE, y * CELL_SIZE)
-            for x in range(WINDOW_WIDTH // CELL_SIZE)]
-            for y in range(WINDOW_HEIGHT // CELL_SIZE)
-        ]
-        # still life patterns (for the others that don't fit as well, e.g. blinker / glider)
-        if pattern == "glider":
-            self.set_pattern([(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)])
-        elif pattern == "blinker":
-            self.set_pattern([(1, 0), (1, 1), (1, 2)])
-        elif pattern == "block":
-            self.set_pattern([(0, 0), (0, 1), (1, 0), (1, 1)])
-        elif pattern == "bee-hive":
-            self.set_pattern([(1, 2), (1, 3), (2, 1), (2, 4), (3, 2), (3, 3)])
-        elif pattern == "loaf":
-            self.set_pattern([(1, 2), (1, 3), (2, 1), (2, 4), (3, 2), (3, 5)])
-        elif pattern == "boat":
-            self.set_pattern([(1, 1), (1, 2), (2, 1), (2, 3), (3, 2)])
-        elif pattern == "tub":
-            self.set_pattern([(1, 2), (2, 1), (2, 3), (3, 2)])
-        else:
-            raise ValueError("Unknown pattern: {}".format(pattern))
+        try:
+            coordinates = _PATTERNS[pattern]
+        except KeyError:
+            raise ValueError("Unknown pattern: {}".format(pattern)) from None
+
+        self.state = _empty_state()
+        self._refresh_wrap_tables()
+        self._device_ahead = False
+        self.state[coordinates[:, 0], coordinates[:, 1]] = 1
 
     def set_pattern(self, coordinates: List[Tuple[int, int]]) -> None:
         """Set a specific pattern of active cells in the grid.
@@ -52,22 +184,28 @@ class GameLogic:
         Args:
             coordinates (List[Tuple[int, int]]): A list of (row, col) tuples specifying the active cells.
 
-        This method marks the cells at the provided coordinates as active (`is_active = True`) in the grid.
+        This method marks the cells at the provided coordinates as active in the state array. Coordinates
+        outside the grid are ignored.
         """
-        for row, col in coordinates:
-            if 0 <= row < len(self.grid) and 0 <= col < len(self.grid[0]):
-                self.grid[row][col].is_active = True
+        if not coordinates:
+            return
+        self.sync_to_host()
+        rows, cols = np.asarray(coordinates, dtype=np.intp).T
+        rows_count, cols_count = self.state.shape
+        inside = (rows >= 0) & (rows < rows_count) & (cols >= 0) & (cols < cols_count)
+        self.state[rows[inside], cols[inside]] = 1
 
-    def get_current_state(self) -> List[List[bool]]:
-        """Retrieve the current state of the grid as a 2D list of booleans.
+    def get_current_state(self) -> np.ndarray:
+        """Retrieve the current state of the grid as a 2D boolean array.
 
         Returns:
-            List[List[bool]]: A 2D list where each element represents the `is_active` state of a cell.
+            np.ndarray: A (rows, cols) boolean array where each element represents the state of a cell.
 
-        This method returns the current state of the grid, where `True` indicates an active cell and
-        `False` indicates an inactive cell.
+        This method returns a copy of the current state of the grid, where `True` indicates an active cell
+        and `False` indicates an inactive cell.
         """
-        return [[cell.is_active for cell in row] for row in self.grid]
+        self.sync_to_host()
+        return self.state.astype(bool)
 
     def save_state(self, filename: str) -> None:
         """Save the current state of the grid to a file.
@@ -75,11 +213,13 @@ class GameLogic:
         Args:
             filename (str): The name of the file where the grid state will be saved.
 
-        This method serializes the grid state into a file using pickle, so that it can be loaded later.
+        This method writes the state array into a compressed NumPy `.npz` archive, with the cells packed into
+        bits (`np.packbits`, eight cells per byte) next to the shape of the grid, so that it can be loaded later.
         """
+        self.sync_to_host()
         try:
             with open(filename, 'wb') as file:
-                pickle.dump([[cell.is_active for cell in row] for row in self.grid], file)
+                np.savez_compressed(file, cells=np.packbits(self.state), shape=np.array(self.state.shape))
         except (OSError, IOError) as e:
             print(f"Error saving state to {filename}: {e}")
 
@@ -89,16 +229,23 @@ class GameLogic:
         Args:
             filename (str): The name of the file to load the grid state from.
 
-        This method attempts to load the grid state from the specified file. If the file is not found or
-        the state cannot be unpickled, it will initialize the grid with a default "loaf" pattern.
+        This method attempts to load the grid state from the specified file, as written by `save_state` (a
+        plain `.npy` state array from older versions is accepted too). If the file is not found or is not a
+        valid saved state, it will initialize the grid with a default "loaf" pattern.
         """
         try:
             with open(filename, 'rb') as file:
-                state = pickle.load(file)
-                for row_index, row in enumerate(state):
-                    for col_index, is_active in enumerate(row):
-                        self.grid[row_index][col_index].is_active = is_active
-        except (FileNotFoundError, pickle.UnpicklingError) as e:
+                data = np.load(file)
+                if isinstance(data, np.ndarray):
+                    state = data
+                else:
+                    with data:
+                        rows, cols = data["shape"]
+                        state = np.unpackbits(data["cells"], count=rows * cols).reshape(rows, cols)
+            self.state = np.ascontiguousarray(state, dtype=np.uint8)
+            self._refresh_wrap_tables()
+            self._device_ahead = False
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile) as e:
             print(f"Error loading state: {e}")
             self._initialize_grid("loaf")
 
@@ -106,56 +253,142 @@ class GameLogic:
         """Update the grid according to the rules of the game with a dynamic revival probability.
 
         This method calculates the current population density and adjusts the revival probability based
-        on the grid's sparsity. It applies the update rules in parallel using a `ThreadPoolExecutor` to
-        improve performance by updating each row concurrently.
+        on the grid's sparsity. The next generation is then computed by the selected `backend`: cell by cell
+        in Python ("python"), with whole-array operations ("numpy"), or by the JIT-compiled `cpu_kernels.step`
+        kernel, which counts the neighbors of 64 bit-packed cells at a time and processes rows in parallel
+        ("numba"). All of them wrap around the edges of the grid (toroidal array).
+
+        The CPU backends write the next generation into a back buffer that is swapped with `state`, so the
+        output grid is not reallocated every generation (the backends may still use temporary arrays of their
+        own); a reference to `state` taken before an update is reused as the back buffer afterwards.
+
+        With the "cuda" backend, the generation is computed on the GPU instead and stays in device memory;
+        `state` is only refreshed by `sync_to_host`.
         """
+        if self.backend == "cuda":
+            self._update_cuda()
+            return
+
         # calculating the current population density
-        active_cells = sum(cell.is_active for row in self.grid for cell in row)
-        total_cells = len(self.grid) * len(self.grid[0])
+        active_cells = int(self.state.sum(dtype=np.int64))
+        total_cells = self.state.size
         density = active_cells / total_cells if total_cells > 0 else 0
 
         # adjusting revival probability based on population density (sparser -> higher revival chance)
         adjusted_revival_prob = BASE_REVIVAL_PROB + (1 - density) * (MAX_REVIVAL_PROB - BASE_REVIVAL_PROB)
 
-        new_grid = [[Cell(cell.x, cell.y) for cell in row] for row in self.grid]
+        # double buffering: the next generation is written into the back buffer, which then becomes `state`
+        back = self._back
+        if back is None or back.shape != self.state.shape:
+            back = np.empty_like(self.state)
+        _CPU_STEPS[self.backend](self, back, adjusted_revival_prob)
+        self.state, self._back = back, self.state
+
+    def run(self, generations: int) -> None:
+        """Advance the grid by several generations back to back.
+
+        Args:
+            generations (int): The number of generations to compute.
+
+        This method is meant for headless runs (e.g. computing many generations before drawing one): the
+        updates are chained without returning to a caller in between, and with the "cuda" backend all of them
+        are queued on the GPU and `state` is only refreshed by the next `sync_to_host`.
+        """
+        if generations < 0:
+            raise ValueError("The number of generations must not be negative")
+        for _ in range(generations):
+            self.update()
+
+    def _ensure_gpu_state(self) -> None:
+        """Allocate the device buffers on first use and upload `state` when it was changed on the host.
+
+        The buffers are allocated once (again only if the shape of `state` changes) and reused for every
+        generation, so the only host/device traffic of an update is the upload of host-side edits (e.g. cells
+        toggled in the GUI). The active cells of an uploaded grid are counted on the device; afterwards the
+        update kernel keeps the count itself. The RNG states are seeded once too, so every generation
+        continues the same independent per-cell streams instead of replaying identical random numbers.
+        """
+        from cuda_kernels import count_alive
 
-        # using ThreadPoolExecutor to parallelize the update process
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.update_row, row, new_grid, adjusted_revival_prob)
-                       for row in range(len(self.grid))]
-            for future in futures:
-                future.result()
+        gpu = self._gpu
+        if gpu is None or gpu.shape != self.state.shape:
+            seed = self.seed if self.seed is not None else rd.randrange(2 ** 32)
+            gpu = self._gpu = _GpuScratch.allocate(self.state, seed)
+            self._device_ahead = False
+        elif not self._device_ahead and not np.array_equal(self.state, gpu.host_buf):
+            gpu.host_buf[...] = self.state
+            gpu.d_a.copy_to_device(gpu.host_buf, stream=gpu.stream)
+        else:
+            return
+        count_alive(gpu.d_a, gpu.d_total, stream=gpu.stream)
+
+    def _update_cuda(self) -> None:
+        """Advance the device-resident grid by one generation, swapping the ping-pong buffers.
+
+        The density is read from the device-side count by the update kernel, so the host never waits here.
+        """
+        from cuda_kernels import run_cuda_kernels
 
-        self.grid = new_grid
+        self._ensure_gpu_state()
+        gpu = self._gpu
 
-    def update_row(self, row: int, new_grid: List[List[Cell]], adjusted_revival_prob: float) -> None:
+        run_cuda_kernels(gpu.d_a, gpu.d_b, gpu.d_rnd, gpu.d_rng, gpu.d_total, gpu.d_new_total,
+                         BASE_REVIVAL_PROB, MAX_REVIVAL_PROB, stream=gpu.stream)
+        gpu.d_a, gpu.d_b = gpu.d_b, gpu.d_a
+        gpu.d_total, gpu.d_new_total = gpu.d_new_total, gpu.d_total
+        self._device_ahead = True
+
+    def sync_to_host(self) -> None:
+        """Copy the latest generation from the GPU into `state`.
+
+        This is a no-op unless the grid was advanced on the GPU since the last call, so it can be called
+        whenever the host needs to read or edit `state` (e.g. once per drawn frame). The grid is copied
+        with a DMA transfer into the pinned host buffer, queued on the same stream as the kernels, and the
+        host only waits for the stream here, when a frame is actually needed.
+        """
+        if not self._device_ahead:
+            return
+        gpu = self._gpu
+        gpu.d_a.copy_to_host(gpu.host_buf, stream=gpu.stream)
+        gpu.stream.synchronize()
+        self.state[...] = gpu.host_buf
+        self._device_ahead = False
+
+    def update_row(self, row: int, new_state: np.ndarray, adjusted_revival_prob: float) -> None:
         """Update a single row of cells based on the game rules.
 
         Args:
             row (int): The index of the row to update.
-            new_grid (List[List[Cell]]): A grid that will be populated with the updated cell states.
+            new_state (np.ndarray): A state array whose row `row` is overwritten with the updated cell states.
             adjusted_revival_prob (float): The probability of revival for dead cells, adjusted by population density.
 
         This method processes each cell in the row, applying the standard game rules for cell survival and revival.
-        It checks the number of live neighbors and updates the cell's state accordingly.
+        It checks the number of live neighbors and updates the cell's state accordingly. It is the per-cell
+        reference of the rules that `update` applies to the whole grid at once.
         """
-        for col in range(len(self.grid[0])):
-            live_neighbors = self.count_neighbors(row, col)
-            cell = self.grid[row][col]
+        # attributes and rows bound to locals once, instead of looked up for every cell
+        count_neighbors = self.count_neighbors
+        random = rd.random
+        cells = self.state[row]
+        new_cells = new_state[row]
+        for col in range(len(cells)):
+            live_neighbors = count_neighbors(row, col)
 
-            if cell.is_active:
+            if cells[col]:
                 if live_neighbors not in (2, 3):
-                    if live_neighbors > 3 and rd.random() < DEATH_PROB:
-                        new_grid[row][col].is_active = False
+                    if live_neighbors > 3 and random() < DEATH_PROB:
+                        new_cells[col] = 0
                     else:
-                        new_grid[row][col].is_active = False
+                        new_cells[col] = 0
                 else:
-                    new_grid[row][col].is_active = True
+                    new_cells[col] = 1
             else:
                 if live_neighbors == 3:
-                    new_grid[row][col].is_active = True
-                elif live_neighbors in (2, 4) and rd.random() < adjusted_revival_prob:
-                    new_grid[row][col].is_active = True
+                    new_cells[col] = 1
+                elif live_neighbors in (2, 4) and random() < adjusted_revival_prob:
+                    new_cells[col] = 1
+                else:
+                    new_cells[col] = 0
 
     def count_neighbors(self, row: int, col: int) -> int:
         """Count the number of active neighbors of a given cell.
@@ -168,10 +401,14 @@ class GameLogic:
             int: The number of active neighbors surrounding the given cell.
 
         This method checks the eight surrounding cells (including diagonals) and counts how many are active.
-        It handles edge wrapping by using modulo arithmetic to ensure the grid wraps around at the edges (toroidal array).
+        It handles edge wrapping by looking the neighboring indices up in the `_wrap` tables (see
+        `_refresh_wrap_tables`), so the grid wraps around at the edges (toroidal array).
         """
-        with self.lock:
-            return sum(
-                self.grid[(row + dr) % len(self.grid)][(col + dc) % len(self.grid[0])].is_active
-                for dr in [-1, 0, 1] for dc in [-1, 0, 1] if (dr, dc) != (0, 0)
-            )
+        state = self.state
+        up_table, down_table, left_table, right_table = self._wrap
+        up, down = up_table[row], down_table[row]
+        left, right = left_table[col], right_table[col]
+        # the eight offsets are unrolled, so no generator or offset tuple is built per call
+        return int(state[up, left] + state[up, col] + state[up, right]
+                   + state[row, left] + state[row, right]
+                   + state[down, left] + state[down, col] + state[down, right])
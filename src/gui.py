@@ -1,60 +1,144 @@
 import pygame
-from dataclasses import dataclass
-from typing import List, Tuple
-from utils import CELL_SIZE, ROWS, COLS, WHITE, BLACK, GREEN
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from utils import CELL_SIZE, ROWS, COLS, WHITE, BLACK, GREEN, GRAY
+
+# colors of the inactive and active cells, indexed by the state array
+_PALETTE = np.array([GRAY, GREEN], dtype=np.uint8)
 
 
 @dataclass
+class _GridFrame:
+    """Buffers used to draw a grid of a given shape, kept across frames so that drawing allocates nothing."""
+    colors: np.ndarray # (cols, rows, 3) uint8 color of each cell, indexed (x, y) like surfarray arrays
+    cells: pygame.Surface # one pixel per cell
+    image: pygame.Surface # the cells scaled up to CELL_SIZE, with the grid lines
+    lines: pygame.Surface # 1-pixel black border of every cell, transparent (color key) elsewhere
+    drawn: Optional[np.ndarray] = None # (rows, cols) state currently shown by `image`, None until first drawn
+
+# frames created by `_grid_frame`, by (rows, cols) of the grid
+_FRAMES: Dict[Tuple[int, int], _GridFrame] = {}
+
+
+@dataclass(slots=True)
 class Cell:
-    """Class representing a cell in the grid."""
-    x: int # X coordinate of the cell
-    y: int # Y coordinate of the cell
-    is_active: bool = False # State of the cell (active or inactive)
+    """Class representing a cell in the grid, as a view of one element of a `GameLogic` state array.
 
-def initialize_gui(window: pygame.Surface) -> List[List[Cell]]:
-    """Initialize the GUI and create the grid of cells.
+    The cell has `__slots__` instead of a per-instance `__dict__`, as a grid creates one per cell.
+    """
+    game_logic: Any = field(repr=False) # GameLogic whose `state` holds the cell
+    row: int # Row index of the cell
+    col: int # Column index of the cell
+
+    @property
+    def x(self) -> int:
+        """X coordinate of the cell."""
+        return self.col * CELL_SIZE
+
+    @property
+    def y(self) -> int:
+        """Y coordinate of the cell."""
+        return self.row * CELL_SIZE
+
+    @property
+    def is_active(self) -> bool:
+        """State of the cell (active or inactive), read from the state array."""
+        self.game_logic.sync_to_host()
+        return bool(self.game_logic.state[self.row, self.col])
+
+    @is_active.setter
+    def is_active(self, value: bool) -> None:
+        self.game_logic.sync_to_host()
+        self.game_logic.state[self.row, self.col] = value
+
+def initialize_gui(window: pygame.Surface) -> np.ndarray:
+    """Initialize the GUI and create the state array of the grid.
 
     Args:
         window (pygame.Surface): The Pygame window surface where the grid will be drawn.
 
     Returns:
-        List[List[Cell]]: A 2D list representing the grid of cells.
+        np.ndarray: A (ROWS, COLS) uint8 array holding the state of each cell (1 = active).
     """
-    grid = [[Cell(x=col * CELL_SIZE, y=row * CELL_SIZE) for col in range(COLS)] for row in range(ROWS)]
-
-    for row in grid:
-        for cell in row:
-            rect = pygame.Rect(cell.x, cell.y, CELL_SIZE, CELL_SIZE)
+    state = np.zeros((ROWS, COLS), dtype=np.uint8)
+    draw_grid(window, state)
+    return state
 
-            color = GREEN if cell.is_active else WHITE
-            pygame.draw.rect(window, color, rect)
+def _grid_frame(rows: int, cols: int) -> _GridFrame:
+    """Get the drawing buffers of a (rows, cols) grid.
 
-            pygame.draw.rect(window, BLACK, rect, 1)
-
-    return grid
+    Args:
+        rows (int): The number of rows of the grid.
+        cols (int): The number of columns of the grid.
 
-def draw_grid(window: pygame.Surface, grid: List[List[Cell]]) -> None:
+    Returns:
+        _GridFrame: The buffers, created (and the grid lines drawn) on first use and kept for the following frames.
+    """
+    frame = _FRAMES.get((rows, cols))
+    if frame is None:
+        size = (cols * CELL_SIZE, rows * CELL_SIZE)
+        lines = pygame.Surface(size)
+        lines.fill(WHITE)
+        lines.set_colorkey(WHITE)
+        for row in range(rows):
+            for col in range(cols):
+                pygame.draw.rect(lines, BLACK, (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE), 1)
+        frame = _GridFrame(
+            colors=np.empty((cols, rows, 3), dtype=np.uint8),
+            cells=pygame.Surface((cols, rows)),
+            image=pygame.Surface(size),
+            lines=lines,
+        )
+        _FRAMES[(rows, cols)] = frame
+    return frame
+
+def draw_grid(window: pygame.Surface, state: np.ndarray) -> None:
     """Draw the grid of cells on the window.
 
     Args:
         window (pygame.Surface): The surface to draw on.
-        grid (List[List[Cell]]): The grid of cells.
+        state (np.ndarray): The (rows, cols) state array of the grid.
 
     Returns:
         None
+
+    The colors of the cells are looked up in a palette for the whole state array at once and turned into a
+    surface with one pixel per cell, which is scaled up to the cell size and covered with the grid lines, so
+    a frame takes a few blits instead of two `pygame.draw.rect` calls per cell. All of it is drawn into the
+    buffers of `_grid_frame`, reused from frame to frame.
+
+    Afterwards, only the cells that changed since the previous frame (usually a small fraction of a Life
+    board) are filled into the cached image with `Surface.fill`; the whole image is rebuilt only when more
+    than a quarter of the cells changed.
     """
-    for row in grid:
-        for cell in row:
-            rect = pygame.Rect(cell.x, cell.y, CELL_SIZE, CELL_SIZE)
-            color = (0, 255, 0) if cell.is_active else (128, 128, 128)
-            pygame.draw.rect(window, color, rect)
-            pygame.draw.rect(window, (0, 0, 0), rect, 1)
-
-def toggle_cell_state(grid: List[List[Cell]], mouse_pos: Tuple[int, int], single_click: bool = False) -> None:
+    frame = _grid_frame(*state.shape)
+    if frame.drawn is None:
+        frame.drawn = state.copy()
+        changed = None
+    else:
+        changed = np.argwhere(state != frame.drawn)
+        frame.drawn[...] = state
+
+    if changed is None or len(changed) > state.size // 4:
+        # surfarray arrays are indexed (x, y), i.e. (col, row)
+        np.take(_PALETTE, state.T, axis=0, out=frame.colors, mode="clip")
+        pygame.surfarray.blit_array(frame.cells, frame.colors)
+        pygame.transform.scale(frame.cells, frame.image.get_size(), frame.image)
+        frame.image.blit(frame.lines, (0, 0))
+    else:
+        # grouped by color, each cell is filled inside its 1-pixel border, which never changes
+        values = state[changed[:, 0], changed[:, 1]]
+        for value, color in enumerate(_PALETTE.tolist()):
+            for row, col in changed[values == value].tolist():
+                frame.image.fill(color, (col * CELL_SIZE + 1, row * CELL_SIZE + 1, CELL_SIZE - 2, CELL_SIZE - 2))
+    window.blit(frame.image, (0, 0))
+
+def toggle_cell_state(state: np.ndarray, mouse_pos: Tuple[int, int], single_click: bool = False) -> None:
     """Toggle the state of a cell when clicked.
 
     Args:
-        grid (List[List[Cell]]): The grid of cells.
+        state (np.ndarray): The (rows, cols) state array of the grid.
         mouse_pos (Tuple[int, int]): The x and y coordinates of the mouse position.
         single_click (bool): If True, toggles the cell state; if False, sets the cell to active.
 
@@ -64,9 +148,8 @@ def toggle_cell_state(grid: List[List[Cell]], mouse_pos: Tuple[int, int], single
     col = mouse_pos[0] // CELL_SIZE
     row = mouse_pos[1] // CELL_SIZE
 
-    if 0 <= row < len(grid) and 0 <= col < len(grid[0]):
-        cell = grid[row][col]
+    if 0 <= row < state.shape[0] and 0 <= col < state.shape[1]:
         if single_click:
-            cell.is_active = not cell.is_active
+            state[row, col] ^= 1
         else:
-            cell.is_active = True
\ No newline at end of file
+            state[row, col] = 1
\ No newline at end of file
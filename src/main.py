@@ -1,11 +1,13 @@
+import pygame
 from utils import WINDOW_HEIGHT, WINDOW_WIDTH
 
 from src import __version__
-from gui import *
+from gui import initialize_gui, draw_grid, toggle_cell_state
 
 
 def main():
     from game_logic import GameLogic
+    from numba import cuda
     """Main entry point of the game."""
 
     pygame.init()
@@ -13,14 +15,13 @@ def main():
     window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.HWSURFACE | pygame.DOUBLEBUF)
     pygame.display.set_caption("Conway's Game of Life")
 
-    grid = initialize_gui(window)
+    state = initialize_gui(window)
     back_buffer = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
 
-    game_logic = GameLogic(grid)
+    game_logic = GameLogic(state, backend="cuda" if cuda.is_available() else "numba")
 
     running = True
     mouse_dragging = False
-    mouse_clicked_pos = None
     simulation_running = False
 
     clock = pygame.time.Clock()
@@ -33,13 +34,15 @@ def main():
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1: # lmb
                     mouse_dragging = True
-                    mouse_clicked_pos = pygame.mouse.get_pos()
-                    toggle_cell_state(grid, mouse_clicked_pos, single_click=True)
+                    toggle_cell_state(game_logic.state, event.pos, single_click=True)
 
             if event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     mouse_dragging = False
-                    mouse_clicked_pos = None
+
+            # dragging activates the cells under the pointer, only when it actually moves
+            if event.type == pygame.MOUSEMOTION and mouse_dragging:
+                toggle_cell_state(game_logic.state, event.pos)
 
             if event.type == pygame.KEYDOWN:
                 # pause the simulation
@@ -48,29 +51,23 @@ def main():
                 # save the grid state (ctrl+S)
                 elif event.key == pygame.K_s and pygame.key.get_mods() & pygame.KMOD_CTRL:
                     if not simulation_running:  # ensuring the simulation is paused when trying to save grid state
-                        game_logic.save_state('game_state.pkl')
+                        game_logic.save_state('game_state.npz')
                         print("Game state saved.")
                 # load the grid state (ctrl+L)
                 elif event.key == pygame.K_l and pygame.key.get_mods() & pygame.KMOD_CTRL:
                     if not simulation_running:  # ensuring the simulation is paused when trying to load grid state
                         try:
-                            game_logic.load_state('game_state.pkl')
+                            game_logic.load_state('game_state.npz')
                             print("Game state loaded.")
                         except FileNotFoundError:
                             print("No saved game state found.")
 
-        if mouse_dragging:
-            mouse_pos = pygame.mouse.get_pos()
-            if mouse_pos != mouse_clicked_pos:
-                toggle_cell_state(grid, mouse_pos)
-                mouse_clicked_pos = mouse_pos
-
         if simulation_running:
             game_logic.update()
 
+        game_logic.sync_to_host()
         back_buffer.fill((0, 0, 0))
-        draw_grid(back_buffer, grid)
-        grid = game_logic.grid
+        draw_grid(back_buffer, game_logic.state)
         window.blit(back_buffer, (0, 0))
         pygame.display.flip()
         clock.tick(10)
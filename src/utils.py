@@ -11,6 +11,7 @@ COLS = 60
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
+GRAY = (128, 128, 128)
 
 BASE_REVIVAL_PROB = 0.02  # base probability of revival for sparse grids
 MAX_REVIVAL_PROB = 0.10   # maximum allowed revival probability for very sparse grids
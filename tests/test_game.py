@@ -1,25 +1,39 @@
 import unittest
 import sys
 import os
+import tempfile
+import numpy as np
+from numba import cuda
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from src.game_logic import *
-from src.gui import *
+from game_logic import *
+from gui import *
 
 
 class TestGameLogic(unittest.TestCase):
     def setUp(self):
         """Setting up the test environment for the game logic."""
-        self.game_logic = GameLogic(grid=[])
+        self.game_logic = GameLogic()
         self.game_logic._initialize_grid("block") # we initialize it with a default known pattern
+        # save files are written to a temporary directory, removed after each test
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.state_file = os.path.join(temp_dir.name, "test_state.npz")
+        self.legacy_state_file = os.path.join(temp_dir.name, "test_state.npy")
 
     def test_initialize_grid(self):
         """Testing the grid initialization with a known pattern."""
-        grid = self.game_logic.grid
+        state = self.game_logic.state
         # Testing for specific patterns like "block"
-        self.assertEqual(grid[0][0].is_active, True)
-        self.assertEqual(grid[1][0].is_active, True)
-        self.assertEqual(grid[0][1].is_active, True)
-        self.assertEqual(grid[1][1].is_active, True)
+        self.assertEqual(state[0, 0], 1)
+        self.assertEqual(state[1, 0], 1)
+        self.assertEqual(state[0, 1], 1)
+        self.assertEqual(state[1, 1], 1)
+        self.assertEqual(state.sum(), 4)
+
+    def test_initialize_grid_unknown_pattern(self):
+        """Testing that an unknown pattern is rejected."""
+        with self.assertRaises(ValueError):
+            self.game_logic._initialize_grid("spaceship")
 
     def test_get_current_state(self):
         """Testing that the current state of the grid is correct."""
@@ -32,24 +46,56 @@ class TestGameLogic(unittest.TestCase):
     def test_save_and_load_state(self):
         """Testing saving and loading the game state."""
         window = pygame.Surface((100, 100))
-        grid = initialize_gui(window)
+        state = initialize_gui(window)
         self.game_logic._initialize_grid("block")
-        self.game_logic.save_state("test_state.pkl")
-        new_game_logic = GameLogic(grid)
-        new_game_logic.load_state("test_state.pkl")
+        self.game_logic.save_state(self.state_file)
+        new_game_logic = GameLogic(state)
+        new_game_logic.load_state(self.state_file)
 
-        self.assertEqual(len(new_game_logic.grid), len(self.game_logic.grid))
-        self.assertEqual(len(new_game_logic.grid[0]), len(self.game_logic.grid[0]))
+        self.assertEqual(new_game_logic.state.shape, self.game_logic.state.shape)
 
         # Checking that the state is the same after loading
         loaded_state = new_game_logic.get_current_state()
-        self.assertEqual(self.game_logic.get_current_state(), loaded_state)
+        np.testing.assert_array_equal(self.game_logic.get_current_state(), loaded_state)
+
+    def test_load_legacy_npy_state(self):
+        """Testing that a state array saved with `np.save` by older versions can still be loaded."""
+        self.game_logic._initialize_grid("glider")
+        np.save(self.legacy_state_file, self.game_logic.state)
+        new_game_logic = GameLogic()
+        new_game_logic.load_state(self.legacy_state_file)
+        np.testing.assert_array_equal(new_game_logic.state, self.game_logic.state)
+
+    def test_load_truncated_state_falls_back_to_loaf(self):
+        """Testing that loading a damaged (truncated or empty) save initializes the "loaf" pattern."""
+        self.game_logic._initialize_grid("glider")
+        self.game_logic.save_state(self.state_file)
+        with open(self.state_file, "rb") as file:
+            data = file.read()
+
+        expected = GameLogic()
+        expected._initialize_grid("loaf")
+        for damaged in (data[:len(data) // 2], b""):
+            with open(self.state_file, "wb") as file:
+                file.write(damaged)
+            self.game_logic.load_state(self.state_file)
+            np.testing.assert_array_equal(self.game_logic.state, expected.state)
+
+    def test_load_invalid_state_falls_back_to_loaf(self):
+        """Testing that loading a file that is not a saved state initializes the "loaf" pattern."""
+        with open(self.state_file, "wb") as file:
+            file.write(b"not a saved state")
+        self.game_logic.load_state(self.state_file)
+
+        expected = GameLogic()
+        expected._initialize_grid("loaf")
+        np.testing.assert_array_equal(self.game_logic.state, expected.state)
 
     def test_update_with_active_cells(self):
         """Testing updating the grid with some active cells."""
         # Setting some cells to be active
-        self.game_logic.grid[0][0].is_active = True
-        self.game_logic.grid[0][1].is_active = True
+        self.game_logic.state[0, 0] = 1
+        self.game_logic.state[0, 1] = 1
         self.game_logic.update()
 
         # Checking if the active cells have changed based on rules
@@ -66,6 +112,99 @@ class TestGameLogic(unittest.TestCase):
         updated_state = self.game_logic.get_current_state()
         self.assertTrue(updated_state[3][5])
 
+    def assert_update_follows_rules(self, game_logic):
+        """Updating `game_logic` once and checking the result against the per-cell rules."""
+        before = game_logic.get_current_state()
+        rows, cols = before.shape
+        counts = [[game_logic.count_neighbors(row, col) for col in range(cols)] for row in range(rows)]
+        game_logic.update()
+        after = game_logic.get_current_state()
+
+        for row in range(rows):
+            for col in range(cols):
+                live_neighbors = counts[row][col]
+                if before[row, col]:
+                    self.assertEqual(bool(after[row, col]), live_neighbors in (2, 3))
+                elif live_neighbors == 3:
+                    self.assertTrue(after[row, col])
+                elif live_neighbors not in (2, 4):
+                    self.assertFalse(after[row, col])
+
+    def test_update_matches_rules(self):
+        """Testing that every CPU backend follows the per-cell rules, including edge wrapping."""
+        for backend in ("python", "numpy", "numba"):
+            with self.subTest(backend=backend):
+                game_logic = GameLogic(backend=backend)
+                game_logic._initialize_grid("glider")
+                game_logic.set_pattern([(0, 58), (0, 59), (59, 59), (30, 30), (30, 31), (30, 32)])
+                for _ in range(2): # the second update writes into the buffer of the first generation
+                    self.assert_update_follows_rules(game_logic)
+
+    def test_update_matches_rules_on_wide_grid(self):
+        """Testing the update on a grid whose rows span several 64-cell words."""
+        rng = np.random.default_rng(0)
+        for backend in ("numpy", "numba"):
+            with self.subTest(backend=backend):
+                game_logic = GameLogic((rng.random((12, 130)) < 0.35).astype(np.uint8), backend=backend)
+                self.assert_update_follows_rules(game_logic)
+
+    def test_run_matches_repeated_updates(self):
+        """Testing that running several generations at once gives the same grid as updating one at a time."""
+        states = []
+        for run in (True, False):
+            game_logic = GameLogic()
+            game_logic._initialize_grid("glider")
+            game_logic.set_pattern([(30, 30), (30, 31), (30, 32)])
+            np.random.seed(3)
+            if run:
+                game_logic.run(5)
+            else:
+                for _ in range(5):
+                    game_logic.update()
+            states.append(game_logic.get_current_state())
+        np.testing.assert_array_equal(states[0], states[1])
+        with self.assertRaises(ValueError):
+            game_logic.run(-1)
+
+    def test_unknown_backend(self):
+        """Testing that an unknown backend is rejected."""
+        with self.assertRaises(ValueError):
+            GameLogic(backend="fortran")
+
+    @unittest.skipUnless(cuda.is_available(), "CUDA is not available")
+    def test_cuda_update_matches_rules(self):
+        """Testing the GPU update over several generations, with a host-side edit in between."""
+        game_logic = GameLogic(backend="cuda")
+        game_logic.set_pattern([(1, 0), (2, 1), (0, 2), (1, 2), (2, 2), (0, 58), (0, 59), (59, 59)])
+        for _ in range(3):
+            self.assert_update_follows_rules(game_logic)
+        game_logic.state[30, 30:33] = 1
+        self.assert_update_follows_rules(game_logic)
+
+    @unittest.skipUnless(cuda.is_available(), "CUDA is not available")
+    def test_cuda_active_count_matches_state(self):
+        """Testing that the active cell count kept on the GPU matches the grid after several updates."""
+        game_logic = GameLogic(backend="cuda", seed=3)
+        game_logic._initialize_grid("loaf")
+        game_logic.set_pattern([(10, 10), (10, 11), (10, 12), (20, 20), (21, 21), (22, 22)])
+        for _ in range(5):
+            game_logic.update()
+            game_logic.sync_to_host()
+            self.assertEqual(int(game_logic._gpu.d_total.copy_to_host()[0]), int(game_logic.state.sum()))
+
+    @unittest.skipUnless(cuda.is_available(), "CUDA is not available")
+    def test_cuda_seed_is_reproducible(self):
+        """Testing that GPU runs with the same seed evolve identically while the random streams advance."""
+        states = []
+        for _ in range(2):
+            game_logic = GameLogic(backend="cuda", seed=7)
+            game_logic._initialize_grid("loaf")
+            game_logic.set_pattern([(10, 10), (10, 11), (20, 20), (21, 21)])
+            for _ in range(4):
+                game_logic.update()
+            states.append(game_logic.get_current_state())
+        np.testing.assert_array_equal(states[0], states[1])
+
     def test_parallel_update(self):
         """Testing that the parallel update works without errors."""
         # Initialize a random grid for testing parallel execution
@@ -78,22 +217,56 @@ class TestGameLogic(unittest.TestCase):
 
     def test_cell_toggling(self):
         """Testing the toggling of cell states using GUI interaction."""
-        grid = []
         window = pygame.Surface((100, 100))
-        grid = initialize_gui(window)
+        state = initialize_gui(window)
         # Toggle some cells in the grid and check state
-        cell = grid[0][0]
-        self.assertFalse(cell.is_active)
-        cell.is_active = not cell.is_active
-        self.assertTrue(cell.is_active)
+        self.assertFalse(state[0, 0])
+        toggle_cell_state(state, (0, 0), single_click=True)
+        self.assertTrue(state[0, 0])
+        toggle_cell_state(state, (0, 0), single_click=True)
+        self.assertFalse(state[0, 0])
+
+    def test_draw_grid_colors(self):
+        """Testing that the grid is drawn with the cell colors and the black cell borders."""
+        window = pygame.Surface((100, 100))
+        state = np.zeros((10, 10), dtype=np.uint8)
+        state[2, 3] = 1
+        draw_grid(window, state)
+        center = CELL_SIZE // 2
+        self.assertEqual(window.get_at((3 * CELL_SIZE + center, 2 * CELL_SIZE + center))[:3], GREEN)
+        self.assertEqual(window.get_at((center, center))[:3], GRAY)
+        self.assertEqual(window.get_at((3 * CELL_SIZE, 2 * CELL_SIZE + center))[:3], BLACK)
+
+        # the next frame only redraws the cells that changed
+        state[2, 3] = 0
+        state[0, 0] = 1
+        draw_grid(window, state)
+        self.assertEqual(window.get_at((3 * CELL_SIZE + center, 2 * CELL_SIZE + center))[:3], GRAY)
+        self.assertEqual(window.get_at((center, center))[:3], GREEN)
+        self.assertEqual(window.get_at((0, center))[:3], BLACK)
 
     def test_random_cell_activation(self):
         """Testing that random cells get activated correctly within defined rules."""
         # Manually set some cells active and check behavior
         self.game_logic._initialize_grid("block")
-        self.game_logic.grid[0][0].is_active = True
+        self.game_logic.state[0, 0] = 1
+        self.game_logic.update()
+        self.assertTrue(self.game_logic.state[0, 0])
+
+    def test_grid_cells_view_state(self):
+        """Testing that the `Cell` objects of the grid read and write the state array."""
+        grid = self.game_logic.grid
+        self.assertEqual(len(grid), self.game_logic.state.shape[0])
+        self.assertEqual(len(grid[0]), self.game_logic.state.shape[1])
+        self.assertTrue(grid[1][1].is_active)
+        self.assertFalse(grid[2][2].is_active)
+        self.assertEqual((grid[2][3].x, grid[2][3].y), (3 * CELL_SIZE, 2 * CELL_SIZE))
+
+        grid[2][2].is_active = True
+        self.assertEqual(self.game_logic.state[2, 2], 1)
         self.game_logic.update()
-        self.assertTrue(self.game_logic.grid[0][0].is_active)
+        self.assertIs(self.game_logic.grid, grid)
+        self.assertEqual(grid[2][2].is_active, bool(self.game_logic.state[2, 2]))
 
 if __name__ == '__main__':
     unittest.main()